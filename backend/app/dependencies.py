@@ -4,13 +4,15 @@ FastAPI dependency injection — provides service instances per request.
 Rewritten for SQLite architecture. Will be populated as components are built.
 """
 
+from fastapi import Request
+
 from app.services.router import get_provider
 from app.services.extraction.extractor import ExtractionService
 
 
-def get_extraction_service() -> ExtractionService:
+def get_extraction_service(request: Request) -> ExtractionService:
     """Create ExtractionService instance with default provider."""
-    provider = get_provider(task="reasoning", sensitive=False)
+    provider = get_provider(sensitive=False, client=request.app.state.http)
     return ExtractionService(provider)
 
 
@@ -7,8 +7,10 @@ Backend entry point. Extraction pipeline + SQLite storage + MCP server.
 from contextlib import asynccontextmanager
 
 from app.config import settings
+from app.services.router import clear_providers
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import httpx
 
 
 @asynccontextmanager
@@ -22,9 +24,17 @@ async def lifespan(app: FastAPI):
     # TODO: Initialize SQLite storage (Component 1.2)
     # TODO: Initialize embedding service (Component 1.3)
 
+    # One connection pool for every LLM provider (see router.get_provider)
+    app.state.http = httpx.AsyncClient(
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=200),
+    )
+
     yield
 
     # Shutdown cleanup
+    clear_providers()
+    await app.state.http.aclose()
 
 
 app = FastAPI(title="Voku", version="0.4.0", lifespan=lifespan)
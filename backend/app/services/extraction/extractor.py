@@ -10,6 +10,31 @@ from .models import Proposition, ExtractionError
 from .prompt import EXTRACTION_SYSTEM_PROMPT
 
 
+def _parse_json_object(raw_response: str) -> dict:
+    """Parse the LLM's JSON object, tolerating ```json fences or stray prose.
+
+    Groq's json_object mode returns bare JSON, parsed as-is. Providers without
+    a JSON mode may wrap it; the outermost {...} span is sliced out up front
+    rather than after a failed parse.
+    """
+    text = raw_response.strip()
+    if not (text.startswith("{") and text.endswith("}")):
+        start = text.find("{")
+        end = text.rfind("}") + 1
+        if start == -1 or end <= start:
+            raise ExtractionError(
+                f"LLM returned invalid JSON: {raw_response[:200]}..."
+            )
+        text = text[start:end]
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ExtractionError(
+            f"LLM returned invalid JSON: {raw_response[:200]}..."
+        ) from e
+
+
 class ExtractionService:
     """Extracts structured propositions from user text using LLM."""
 
@@ -33,12 +58,7 @@ class ExtractionService:
         except ProviderError as e:
             raise e
 
-        try:
-            response_data = json.loads(raw_response)
-        except json.JSONDecodeError as e:
-            raise ExtractionError(
-                f"LLM returned invalid JSON: {raw_response[:200]}..."
-            ) from e
+        response_data = _parse_json_object(raw_response)
 
         if "propositions" not in response_data:
             raise ExtractionError(
@@ -5,11 +5,14 @@ Component 1.4 in COMPONENT_SPEC.md.
 Replaces old ChatService.
 """
 
+import asyncio
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
 from models.proposition import ConversationMessage
 
 from services.extraction.models import Proposition
@@ -18,6 +21,25 @@ from services.storage.models import StoredProposition
 # Dedup threshold — cosine similarity above this means "same proposition"
 DEDUP_THRESHOLD = 0.95
 
+# Max in-flight LLM extraction calls while ingesting a conversation
+EXTRACTION_CONCURRENCY = 8
+
+
+def _first_occurrences(
+    embeddings: np.ndarray, threshold: float, keep: np.ndarray
+) -> np.ndarray:
+    """Drop rows that duplicate an earlier kept row of the same batch.
+
+    Mirrors one-at-a-time ingestion, where each stored proposition is
+    visible to the dedup check of the propositions after it.
+    """
+    keep = keep.copy()
+    normalized = embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10)
+    for i in range(len(keep)):
+        if keep[i]:
+            keep[i + 1:] &= normalized[i + 1:] @ normalized[i] < threshold
+    return keep
+
 
 @dataclass
 class IngestionResult:
@@ -52,70 +74,144 @@ class IngestionService:
     # Core: single message
     # ------------------------------------------------------------------
 
-    async def ingest_message(self, message: ConversationMessage) -> IngestionResult:
-        """Ingest a single message: extract propositions, embed, dedup, store."""
-        result = IngestionResult(session_id=message.session_id)
+    async def ingest_message(
+        self, message: ConversationMessage, now: datetime | None = None
+    ) -> IngestionResult:
+        """Ingest a single message: extract propositions, embed, dedup, store.
 
+        Pass `now` to stamp a whole batch with one created_at timestamp.
+        """
         # 1. Extract propositions (async LLM call)
         propositions: list[Proposition] = await self._extraction.extract(message.text)
-        result.propositions_extracted = len(propositions)
-
-        # 2–4. For each proposition: embed → dedup → store
-        for prop in propositions:
-            embedding = self._embedder.embed(prop.proposition)
-
-            # Dedup: check if a near-identical proposition already exists
-            similar = self._storage.find_similar(embedding, threshold=DEDUP_THRESHOLD)
-            if similar:
-                result.duplicates_found += 1
-                continue
-
-            # Build StoredProposition with provenance from the message
-            stored_prop = StoredProposition(
-                id=str(uuid.uuid4()),
-                text=prop.proposition,
-                node_type=prop.node_type,
-                confidence=prop.confidence,
-                source_type="conversation",
-                created_at=datetime.now(timezone.utc).isoformat(),
+        # 2-4. Embed, dedup, store — blocking CPU + SQLite work, off the event loop
+        results = await asyncio.to_thread(
+            self._store_extracted, [(message, propositions)], now
+        )
+        return results[0]
+
+    def _store_extracted(
+        self,
+        extracted: list[tuple[ConversationMessage, list[Proposition]]],
+        now: datetime | None = None,
+    ) -> list[IngestionResult]:
+        """Embed, dedup and store propositions for one or more messages at once.
+
+        Rows stay in message order, so dedup keeps the earliest occurrence.
+        """
+        results = [
+            IngestionResult(
                 session_id=message.session_id,
-                message_index=message.message_index,
-                source_char_start=message.source_char_start,
-                source_char_end=message.source_char_end,
-                source_file=message.source_file,
+                propositions_extracted=len(propositions),
             )
-
-            self._storage.store_proposition(stored_prop)
-            self._storage.store_embedding(
-                stored_prop.id, embedding, self._embedder.model_name
+            for message, propositions in extracted
+        ]
+        rows = [
+            (i, message, prop)
+            for i, (message, propositions) in enumerate(extracted)
+            for prop in propositions
+        ]
+        if not rows:
+            return results
+        created_at = (now or datetime.now(timezone.utc)).isoformat()
+
+        # 2. Embed every proposition in one batch
+        embeddings = self._embedder.embed_batch([prop.proposition for _, _, prop in rows])
+
+        # 3-4. Dedup and store inside one transaction: it holds the storage
+        # lock, so a concurrent ingest can't insert between our check and write
+        with self._storage.transaction():
+            self._dedup_and_store(rows, embeddings, results, created_at)
+        return results
+
+    def _dedup_and_store(
+        self,
+        rows: list[tuple[int, ConversationMessage, Proposition]],
+        embeddings: np.ndarray,
+        results: list[IngestionResult],
+        created_at: str,
+    ) -> None:
+        """Dedup against storage (one scan) and earlier rows, then store survivors."""
+        is_duplicate = self._storage.find_similar_batch(embeddings, threshold=DEDUP_THRESHOLD)
+        keep = _first_occurrences(embeddings, DEDUP_THRESHOLD, ~is_duplicate)
+
+        # Survivors keep provenance from their own message
+        stored_props = []
+        for (i, message, prop), kept in zip(rows, keep):
+            if not kept:
+                results[i].duplicates_found += 1
+                continue
+            stored_props.append(
+                StoredProposition(
+                    id=str(uuid.uuid4()),
+                    text=prop.proposition,
+                    node_type=prop.node_type,
+                    confidence=prop.confidence,
+                    source_type="conversation",
+                    created_at=created_at,
+                    session_id=message.session_id,
+                    message_index=message.message_index,
+                    source_char_start=message.source_char_start,
+                    source_char_end=message.source_char_end,
+                    source_file=message.source_file,
+                )
             )
-            result.propositions_stored += 1
+            results[i].propositions_stored += 1
 
-        return result
+        self._storage.store_propositions(
+            stored_props, embeddings[keep], self._embedder.model_name
+        )
 
     # ------------------------------------------------------------------
     # Batch: full conversation
     # ------------------------------------------------------------------
 
     async def ingest_conversation(
-        self, messages: list[ConversationMessage]
+        self, messages: list[ConversationMessage], now: datetime | None = None
     ) -> BatchIngestionResult:
-        """Ingest a list of messages — only user messages are processed."""
-        batch = BatchIngestionResult(total_messages=len(messages))
-        sessions_seen: set[str] = set()
-
-        for msg in messages:
-            if msg.speaker != "user":
-                continue
+        """Ingest a list of messages — only user messages are processed.
 
-            sessions_seen.add(msg.session_id)
-
-            try:
-                result = await self.ingest_message(msg)
-                batch.total_propositions_extracted += result.propositions_extracted
-                batch.total_propositions_stored += result.propositions_stored
-            except Exception as e:
-                batch.errors.append(f"Message {msg.message_index}: {e}")
+        Every proposition in the conversation shares one created_at timestamp.
+        """
+        batch = BatchIngestionResult(total_messages=len(messages))
+        user_messages = [msg for msg in messages if msg.speaker == "user"]
+        sessions_seen = {msg.session_id for msg in user_messages}
+
+        # Extraction is LLM-latency-bound: run the calls concurrently (bounded).
+        semaphore = asyncio.Semaphore(EXTRACTION_CONCURRENCY)
+
+        async def extract(msg: ConversationMessage) -> list[Proposition]:
+            async with semaphore:
+                return await self._extraction.extract(msg.text)
+
+        extractions = await asyncio.gather(
+            *(extract(msg) for msg in user_messages), return_exceptions=True
+        )
+
+        extracted = []
+        for msg, propositions in zip(user_messages, extractions):
+            if isinstance(propositions, BaseException):
+                batch.errors.append(f"Message {msg.message_index}: {propositions}")
+            else:
+                extracted.append((msg, propositions))
+
+        # Embed + dedup the whole conversation in memory, then store it in one go
+        try:
+            results = await asyncio.to_thread(self._store_extracted, extracted, now)
+        except Exception:
+            # The batch rolled back as a unit. Retry message by message so only
+            # the failing message is lost, as with one-at-a-time ingestion.
+            results = []
+            for msg, propositions in extracted:
+                try:
+                    results += await asyncio.to_thread(
+                        self._store_extracted, [(msg, propositions)], now
+                    )
+                except Exception as e:
+                    batch.errors.append(f"Message {msg.message_index}: {e}")
+
+        for result in results:
+            batch.total_propositions_extracted += result.propositions_extracted
+            batch.total_propositions_stored += result.propositions_stored
 
         batch.sessions_processed = len(sessions_seen)
         return batch
@@ -131,6 +227,7 @@ class IngestionService:
         parser = ConversationParser()
         aggregate = BatchIngestionResult()
         sessions_seen: set[str] = set()
+        now = datetime.now(timezone.utc)
 
         for filepath in sorted(dirpath.glob("*.md")):
             try:
@@ -139,7 +236,7 @@ class IngestionService:
                 aggregate.errors.append(f"Parse {filepath.name}: {e}")
                 continue
 
-            result = await self.ingest_conversation(messages)
+            result = await self.ingest_conversation(messages, now)
             aggregate.total_messages += result.total_messages
             aggregate.total_propositions_extracted += (
                 result.total_propositions_extracted
@@ -15,9 +15,88 @@ SESSION_ID_PATTERN = re.compile(r"https://claude\.ai/chat/([a-f0-9-]+)")
 MESSAGE_HEADING_PATTERN = re.compile(r"^## (Prompt|Response):\s*$", re.MULTILINE)
 BASE64_IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\(data:image/[^)]+\)")
 FENCED_BLOCK_PATTERN = re.compile(r"````plaintext\n.*?````", re.DOTALL)
+FENCE_OPEN_LEN = len("````plaintext\n")
+FENCE_CLOSE_LEN = len("````")
 FOOTER_PATTERN = re.compile(
     r"\n---\s*\nPowered by \[Claude Exporter\]\([^)]+\)\s*$"
 )
+# Body cleanup in one scan: a base64 image with the newlines around it, or a blank-line run
+CLEANUP_PATTERN = re.compile(
+    rf"(?P<lead>\n*){BASE64_IMAGE_PATTERN.pattern}(?P<trail>\n*)|(?P<blank>\n{{3,}})"
+)
+
+
+TIMESTAMP_FORMAT = "%m/%d/%Y, %I:%M:%S %p"
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an export timestamp like "2/10/2026, 9:53:12 PM".
+
+    Splits the fixed US-locale layout by hand; anything off that layout falls
+    back to strptime, which raises ValueError for non-timestamps as before.
+    """
+    date_part, _, time_part = value.partition(", ")
+    month, _, rest = date_part.partition("/")
+    day, _, year = rest.partition("/")
+    clock, _, meridiem = time_part.partition(" ")
+    hour, _, rest = clock.partition(":")
+    minute, _, second = rest.partition(":")
+    digits = year + month + day + hour + minute + second
+    if (
+        meridiem in ("AM", "PM")
+        and len(year) == 4
+        and 0 < len(month) <= 2 and 0 < len(day) <= 2 and 0 < len(hour) <= 2
+        and len(minute) == 2 and len(second) == 2
+        and digits.isascii() and digits.isdecimal()
+        and 1 <= int(hour) <= 12
+    ):
+        try:
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour) % 12 + (12 if meridiem == "PM" else 0),
+                int(minute), int(second),
+            )
+        except ValueError:
+            pass
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def _strip_span(text: str, start: int, end: int) -> tuple[int, int]:
+    """Narrow text[start:end] to exclude surrounding whitespace, as offsets."""
+    segment = text[start:end]
+    stripped = segment.lstrip()
+    start += len(segment) - len(stripped)
+    return start, start + len(stripped.rstrip())
+
+
+def _clean_span(text: str, start: int, end: int) -> str:
+    """text[start:end] with base64 images dropped and 3+ newlines collapsed to 2.
+
+    Newlines on either side of a dropped image join into one run before
+    collapsing, same as removing the images first and collapsing after.
+    """
+    # Most messages have neither: two C-level substring scans skip the regex
+    if text.find("\n\n\n", start, end) < 0 and text.find("](data:image/", start, end) < 0:
+        return text[start:end].strip()
+
+    parts = []
+    pos = start
+    newlines = 0  # pending newline run, carried across adjacent matches
+    for m in CLEANUP_PATTERN.finditer(text, start, end):
+        if m.start() > pos:
+            parts.append("\n" * (newlines if newlines < 3 else 2))
+            parts.append(text[pos:m.start()])
+            newlines = 0
+        if m.lastgroup == "blank":
+            newlines += m.end() - m.start()
+        else:
+            newlines += len(m.group("lead")) + len(m.group("trail"))
+        pos = m.end()
+    if pos == start:
+        return text[start:end].strip()
+    parts.append("\n" * (newlines if newlines < 3 else 2))
+    parts.append(text[pos:end])
+    return "".join(parts).strip()
 
 
 class ConversationParser:
@@ -35,84 +114,70 @@ class ConversationParser:
         # Strip footer
         raw_clean = FOOTER_PATTERN.sub("", raw)
 
-        # Find all message headings and their positions
-        headings = list(MESSAGE_HEADING_PATTERN.finditer(raw_clean))
-        if not headings:
+        # Message headings as plain (speaker, content_start, content_end) spans;
+        # the Match objects are dropped as soon as their offsets are read
+        spans = []
+        for heading in MESSAGE_HEADING_PATTERN.finditer(raw_clean):
+            speaker = "user" if heading.group(1) == "Prompt" else "assistant"
+            if spans:
+                spans[-1][2] = heading.start()
+            spans.append([speaker, heading.end() + 1, len(raw_clean)])
+        if not spans:
             return []
 
         messages = []
-        for i, heading in enumerate(headings):
-            speaker = "user" if heading.group(1) == "Prompt" else "assistant"
-
-            # Content runs from after heading to next heading (or end)
-            content_start = heading.end() + 1
-            if i + 1 < len(headings):
-                content_end = headings[i + 1].start()
-            else:
-                content_end = len(raw_clean)
-
-            block = raw_clean[content_start:content_end].strip()
-            if not block:
+        for speaker, content_start, content_end in spans:
+            # Work in raw_clean offsets so provenance needs no substring search
+            block_start, block_end = _strip_span(raw_clean, content_start, content_end)
+            if block_start == block_end:
                 continue
 
             # First line is the timestamp
-            lines = block.split("\n", 1)
-            timestamp_str = lines[0].strip()
+            line_end = raw_clean.find("\n", block_start, block_end)
+            if line_end < 0:
+                line_end = block_end
+            timestamp_str = raw_clean[block_start:line_end].strip()
             try:
-                timestamp = datetime.strptime(timestamp_str, "%m/%d/%Y, %I:%M:%S %p")
+                timestamp = _parse_timestamp(timestamp_str)
             except ValueError:
                 continue
 
             # Everything after timestamp is message body
-            body = lines[1].strip() if len(lines) > 1 else ""
-            if not body:
+            body_start, body_end = _strip_span(raw_clean, line_end + 1, block_end)
+            if body_start >= body_end:
                 continue
 
             # For assistant messages: extract reasoning, then get text after last block
             assistant_reasoning = None
+            text_start, text_end = body_start, body_end
             if speaker == "assistant":
-                # Collect all fenced block content as reasoning
+                # One pass: collect fenced block content as reasoning, keep the last
                 reasoning_parts = []
-                for m in FENCED_BLOCK_PATTERN.finditer(body):
-                    inner = m.group(0)
-                    inner = re.sub(r"^````plaintext\n", "", inner)
-                    inner = re.sub(r"\n?````$", "", inner)
+                last_block = None
+                for m in FENCED_BLOCK_PATTERN.finditer(raw_clean, body_start, body_end):
+                    last_block = m
+                    # Delimiters are literal: slice them off instead of re.sub
+                    inner = raw_clean[m.start() + FENCE_OPEN_LEN:m.end() - FENCE_CLOSE_LEN]
                     inner = inner.strip()
                     if inner:
                         reasoning_parts.append(inner)
                 if reasoning_parts:
                     assistant_reasoning = "\n\n".join(reasoning_parts)
 
-                # Find position after the last fenced block
-                last_block = None
-                for m in FENCED_BLOCK_PATTERN.finditer(body):
-                    last_block = m
+                # Text is whatever follows the last fenced block
                 if last_block:
-                    text = body[last_block.end():].strip()
-                else:
-                    text = body
-            else:
-                text = body
-
-            # Strip base64 images
-            text = BASE64_IMAGE_PATTERN.sub("", text)
+                    text_start, text_end = _strip_span(raw_clean, last_block.end(), body_end)
 
-            # Clean up whitespace
-            text = re.sub(r"\n{3,}", "\n\n", text).strip()
+            # Strip base64 images and collapse blank lines
+            text = _clean_span(raw_clean, text_start, text_end)
 
             if not text:
                 continue
 
-            # Char offsets: find where msg.text starts/ends in raw_clean
-            # so that raw[start:end] contains msg.text as a substring
-            text_pos = raw_clean.find(text, heading.start())
-            if text_pos >= 0:
-                source_char_start = text_pos
-                source_char_end = text_pos + len(text)
-            else:
-                # Fallback: use full block boundaries
-                source_char_start = heading.start()
-                source_char_end = content_end
+            # Char offsets: the span of raw_clean that msg.text was cut from.
+            # The footer is only stripped from the end, so these index raw too.
+            source_char_start = text_start
+            source_char_end = text_end
 
             messages.append(
                 ConversationMessage(
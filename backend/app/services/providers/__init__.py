@@ -1,5 +1,6 @@
 from .base import Provider
+from .cached_provider import CachedProvider
 from .groq_provider import GroqProvider
 from .ollama_provider import OllamaProvider
 
-__all__ = ["Provider", "GroqProvider", "OllamaProvider"]
\ No newline at end of file
+__all__ = ["Provider", "CachedProvider", "GroqProvider", "OllamaProvider"]
\ No newline at end of file
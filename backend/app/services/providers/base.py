@@ -21,6 +21,20 @@ class Provider(ABC):
         """Text completion. For future reasoning tasks."""
         pass
 
+    def completion_payload(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> dict:
+        """The request complete() would send, defaults resolved. Used as a cache key."""
+        return {"prompt": prompt, "system_prompt": system_prompt, "model": model}
+
+    async def aclose(self) -> None:
+        """Release pooled connections. Providers holding an HTTP client override this."""
+        pass
+
 
 class ProviderError(Exception):
     """Custom exception for LLM provider errors."""
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+
+from .base import Provider
+
+DEFAULT_CACHE_PATH = Path.home() / ".voku" / "llm_cache.sqlite"
+
+
+def _is_json(response: str) -> bool:
+    """Default cacheability check: extraction parses replies as JSON, so anything else failed."""
+    try:
+        json.loads(response)
+    except ValueError:
+        return False
+    return True
+
+
+class CachedProvider(Provider):
+    """Disk cache in front of another provider's complete(). For dev scripts, not the app.
+
+    Calls whose resolved request (model, messages, response_format, max_tokens…)
+    is identical are answered from a local SQLite file instead of the network.
+    Only responses that pass `validate` are stored, so a malformed reply is
+    retried next run rather than replayed. Set VOKU_LLM_CACHE=off to bypass.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        path: str | Path = DEFAULT_CACHE_PATH,
+        validate: Callable[[str], bool] = _is_json,
+    ):
+        self._provider = provider
+        self._validate = validate
+        self._enabled = os.getenv("VOKU_LLM_CACHE", "on").lower() != "off"
+        self._conn: Optional[sqlite3.Connection] = None
+        if self._enabled:
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+            )
+
+    def _key(self, prompt: str, system_prompt: Optional[str], model: Optional[str]) -> str:
+        """sha256 over the request the provider would actually send, defaults
+        included — changing a default model or parameter in code is a miss."""
+        payload = self._provider.completion_payload(
+            prompt, system_prompt=system_prompt, model=model
+        )
+        parts = [type(self._provider).__name__, payload]
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def vision(self, image_base64: str, prompt: str) -> str:
+        return await self._provider.vision(image_base64, prompt)
+
+    async def complete(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        if self._conn is None:
+            return await self._provider.complete(
+                prompt, system_prompt=system_prompt, model=model
+            )
+
+        key = self._key(prompt, system_prompt, model)
+        row = self._conn.execute(
+            "SELECT response FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        # Only successful, valid responses are cached — the rest retry next run
+        response = await self._provider.complete(
+            prompt, system_prompt=system_prompt, model=model
+        )
+        if not self._validate(response):
+            return response
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                (key, response),
+            )
+        return response
+
+    async def aclose(self) -> None:
+        await self._provider.aclose()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Optional
 
@@ -12,15 +13,63 @@ load_dotenv()
 class GroqProvider(Provider):
     """Groq cloud inference. Fast, free tier, data leaves machine."""
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """Pass `client` to share an app-wide connection pool; otherwise one is made lazily."""
         self.api_key = os.getenv("GROQ_API_KEY")
         self.base_url = "https://api.groq.com/openai/v1"
-
-    async def vision(self, image_base64: str, prompt: str) -> str:
-        headers = {
+        self._headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        self._client = client
+        self._owns_client = client is None
+        # Admission control: at most `_limit` requests in flight. The limit
+        # halves on a 429 and creeps back up to the configured ceiling on
+        # success; a Condition (unlike a Semaphore) lets it resize safely.
+        self._max_concurrency = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
+        self._limit = self._max_concurrency
+        self._active = 0
+        self._slots = asyncio.Condition()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Pooled client — keeps connections alive so calls skip the TCP/TLS handshake."""
+        if self._owns_client and (self._client is None or self._client.is_closed):
+            self._client = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections. Call on shutdown. A shared client is left to its owner."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, payload: dict) -> httpx.Response:
+        """POST a chat completion once a slot is free, adapting the limit to 429s."""
+        async with self._slots:
+            while self._active >= self._limit:
+                await self._slots.wait()
+            self._active += 1
+
+        status = None
+        try:
+            response = await self._get_client().post(
+                f"{self.base_url}/chat/completions", headers=self._headers, json=payload
+            )
+            status = response.status_code
+            return response
+        finally:
+            async with self._slots:
+                self._active -= 1
+                if status == 429:
+                    self._limit = max(1, self._limit // 2)
+                elif status is not None and status < 400:
+                    self._limit = min(self._max_concurrency, self._limit + 1)
+                self._slots.notify(max(self._limit - self._active, 0))
+
+    async def vision(self, image_base64: str, prompt: str) -> str:
         payload = {
             "model": "meta-llama/llama-4-scout-17b-16e-instruct",
             "messages": [
@@ -39,30 +88,23 @@ class GroqProvider(Provider):
             ],
             "max_tokens": 1024,
         }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions", headers=headers, json=payload
-            )
+        response = await self._post(payload)
         data = response.json()
         return data.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-    async def complete(
+    def completion_payload(
         self,
         prompt: str,
         *,
         system_prompt: Optional[str] = None,
         model: Optional[str] = None,
-    ) -> str:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+    ) -> dict:
         # Conditionally prepend a system prompt if provided
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        payload = {
+        return {
             "model": model or "llama-3.3-70b-versatile",
             "messages": messages,
             "max_tokens": 1024,
@@ -71,12 +113,18 @@ class GroqProvider(Provider):
             },  # Ensure Groq returns a valid JSON object but does NOT guarantee JSON matches schema
         }
 
+    async def complete(
+        self,
+        prompt: str,
+        *,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> str:
+        payload = self.completion_payload(prompt, system_prompt=system_prompt, model=model)
+
         # --- Boundary 1: Network call to Groq API ---
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions", headers=headers, json=payload
-                )
+            response = await self._post(payload)
             response.raise_for_status()  # Raise an error for bad status codes
         except httpx.TimeoutException:
             raise ProviderError("Request to Groq API timed out after 60s.")
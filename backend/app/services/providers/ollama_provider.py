@@ -1,32 +1,67 @@
+from typing import Optional
+
 import httpx
 from .base import Provider
 
 class OllamaProvider(Provider):
   """Local Ollama inference. Private, free, but slower."""
-  def __init__(self, base_url: str = "http://localhost:11434"):
+  def __init__(self, base_url: str = "http://localhost:11434", client: Optional[httpx.AsyncClient] = None):
     self.base_url = base_url
+    # Pass `client` to share an app-wide connection pool; otherwise one is made lazily
+    self._client = client
+    self._owns_client = client is None
+
+  def _get_client(self) -> httpx.AsyncClient:
+    """Pooled client — reuses the local connection across calls."""
+    if self._owns_client and (self._client is None or self._client.is_closed):
+      self._client = httpx.AsyncClient(timeout=60.0)
+    return self._client
+
+  async def aclose(self) -> None:
+    if self._owns_client and self._client is not None:
+      await self._client.aclose()
+      self._client = None
 
   async def vision(self, image_base64: str, prompt: str) -> str:
-    async with httpx.AsyncClient(timeout=60.0) as client:
-      response = await client.post(
-        f"{self.base_url}/api/generate",
-        json={
-          "model": "llama3.2-vision",
-          "prompt": prompt,
-          "images": [image_base64],
-          "stream": False
-        }
-      )
+    response = await self._get_client().post(
+      f"{self.base_url}/api/generate",
+      json={
+        "model": "llama3.2-vision",
+        "prompt": prompt,
+        "images": [image_base64],
+        "stream": False
+      }
+    )
     return response.json().get("response", "")
   
-  async def complete(self, prompt: str) -> str:
-    async with httpx.AsyncClient(timeout=60.0) as client:
-      response = await client.post(
-        f"{self.base_url}/api/generate",
-        json={
-          "model": "llama3.2",
-          "prompt": prompt,
-          "stream": False
-        }
-      )
-    return response.json().get("response", "")
\ No newline at end of file
+  def completion_payload(
+    self,
+    prompt: str,
+    *,
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+  ) -> dict:
+    payload = {
+      "model": model or "llama3.2",
+      "prompt": prompt,
+      "stream": False
+    }
+    # Sent as its own field so the constant prefix stays byte-identical and
+    # Ollama can reuse its KV cache across calls
+    if system_prompt:
+      payload["system"] = system_prompt
+    return payload
+
+  async def complete(
+    self,
+    prompt: str,
+    *,
+    system_prompt: Optional[str] = None,
+    model: Optional[str] = None,
+  ) -> str:
+    payload = self.completion_payload(prompt, system_prompt=system_prompt, model=model)
+    response = await self._get_client().post(
+      f"{self.base_url}/api/generate",
+      json=payload
+    )
+    return response.json().get("response", "")
@@ -1,11 +1,39 @@
 import os
+from typing import Optional
+
+import httpx
 from dotenv import load_dotenv
 from .providers import GroqProvider, OllamaProvider, Provider
 
 load_dotenv()
 
 
-def get_provider(sensitive: bool = False) -> Provider:
+# One instance per (kind, app-wide HTTP client), so its connection pool is reused.
+# Only client-backed providers are cached: a provider's admission Condition and
+# its lazily made client bind to the event loop that first uses them, and the
+# lifespan client lives on the app's loop for the whole process.
+_PROVIDERS: dict[tuple[str, httpx.AsyncClient], Provider] = {}
+
+
+def _new(kind: str, client: Optional[httpx.AsyncClient]) -> Provider:
+    if kind == "local":
+        return OllamaProvider(client=client)
+    return GroqProvider(client=client)
+
+
+def _build(kind: str, client: Optional[httpx.AsyncClient]) -> Provider:
+    """Provider for `kind` ("local" or "groq"): shared per client, else a fresh one."""
+    if client is None:
+        return _new(kind, client)
+    provider = _PROVIDERS.get((kind, client))
+    if provider is None:
+        provider = _PROVIDERS[(kind, client)] = _new(kind, client)
+    return provider
+
+
+def get_provider(
+    sensitive: bool = False, client: Optional[httpx.AsyncClient] = None
+) -> Provider:
     """
     Route to appropriate LLM provider.
 
@@ -16,20 +44,30 @@ def get_provider(sensitive: bool = False) -> Provider:
 
     Args:
         sensitive: If True, override to local provider (Ollama)
+        client: App-wide HTTP client to send requests through (see main.lifespan);
+            without one, a new provider with its own pool is returned, and the
+            caller should `await provider.aclose()` when done
 
     Returns:
-        Provider instance
+        Provider instance (shared when `client` is given)
     """
     if sensitive:
-        return OllamaProvider()
+        return _build("local", client)
 
     provider_setting = os.getenv("VOKU_PROVIDER", "groq").lower()
 
     if provider_setting == "local":
-        return OllamaProvider()
+        return _build("local", client)
 
     # Auto-fallback: no API key → use local (Constraint 3.11: zero-cost default)
     if not os.getenv("GROQ_API_KEY"):
-        return OllamaProvider()
+        return _build("local", client)
+
+    return _build("groq", client)
+
 
-    return GroqProvider()
+def clear_providers() -> None:
+    """Forget the shared providers. Call on app shutdown, before closing the
+    app-wide client; the providers don't own that client, so there is nothing
+    of theirs to close."""
+    _PROVIDERS.clear()
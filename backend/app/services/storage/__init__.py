@@ -5,6 +5,7 @@ Component 1.2 in COMPONENT_SPEC.md.
 """
 
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
 from datetime import datetime
 
 import numpy as np
@@ -25,11 +26,29 @@ class StorageService(ABC):
         """Store an embedding vector for a proposition."""
         ...
 
+    @abstractmethod
+    def store_propositions(
+        self, propositions: list[StoredProposition], embeddings: np.ndarray, model: str
+    ) -> list[str]:
+        """Store propositions with their embeddings (row-aligned) in one batch. Returns IDs."""
+        ...
+
+    @abstractmethod
+    def transaction(self) -> AbstractContextManager:
+        """Context manager: one commit for the block, and no other caller's
+        reads or writes interleave with it (check-then-insert is atomic)."""
+        ...
+
     @abstractmethod
     def find_similar(self, embedding: np.ndarray, threshold: float = 0.85, limit: int = 10) -> list[SimilarResult]:
         """Find propositions with similar embeddings above threshold."""
         ...
 
+    @abstractmethod
+    def find_similar_batch(self, embeddings: np.ndarray, threshold: float = 0.85) -> np.ndarray:
+        """For each row of an (N, D) matrix, whether a stored embedding is above threshold. Returns bool[N]."""
+        ...
+
     @abstractmethod
     def find_by_timerange(self, start: datetime, end: datetime) -> list[StoredProposition]:
         """Find propositions created within a time range."""
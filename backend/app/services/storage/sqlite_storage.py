@@ -6,8 +6,12 @@ Vector strategy: load all embeddings into memory on startup, cosine similarity v
 At 50K propositions × 768 dims: ~150MB memory, <15ms search.
 """
 
+import functools
 import json
+import operator
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -16,18 +20,98 @@ import numpy as np
 from . import StorageService
 from .models import StoredProposition, SimilarResult
 
+# Smallest capacity the embedding cache grows to; it doubles from there
+_MIN_CAPACITY = 1024
+
+# SQLite's default cap on bound parameters per statement is 999
+_MAX_SQL_PARAMS = 900
+
+
+# Scalar proposition columns, bound positionally; domain_tags (JSON) goes last
+_PROPOSITION_COLUMNS = (
+    "id", "text", "node_type", "confidence", "source_type", "source_char_start",
+    "source_char_end", "source_file", "created_at", "session_id", "message_index",
+    "status",
+)
+_proposition_fields = operator.attrgetter(*_PROPOSITION_COLUMNS)
+
+_INSERT_PROPOSITION_SQL = (
+    f"INSERT INTO propositions ({', '.join(_PROPOSITION_COLUMNS)}, domain_tags) "
+    f"VALUES ({', '.join('?' * (len(_PROPOSITION_COLUMNS) + 1))})"
+)
+
+_INSERT_EMBEDDING_SQL = (
+    "INSERT OR REPLACE INTO embeddings (proposition_id, embedding, model, dimensions) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first.
+
+    argpartition finds the top k in O(n); only those k get sorted.
+    """
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    if len(scores) > k:
+        top = np.argpartition(scores, -k)[-k:]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(scores[top])[::-1]]
+
+
+def _encode_tags(tags: list[str]) -> str:
+    """Serialize domain_tags. Untagged is the common case and skips the encoder."""
+    if not tags:
+        return "[]"
+    return json.dumps(tags)
+
+
+def _decode_tags(raw: str) -> list[str]:
+    """Parse the domain_tags column, skipping the decoder for the '[]' default."""
+    if raw == "[]":
+        return []
+    return json.loads(raw)
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row (cosine similarity becomes a dot product)."""
+    vectors = np.atleast_2d(vectors).astype(np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-10)
+
+
+def _locked(method):
+    """Run a storage method under the instance lock (connection + cache are shared)."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class SQLiteStorage(StorageService):
     """SQLite implementation. Single file, numpy for vector search."""
 
     def __init__(self, db_path: str | Path):
         self.db_path = str(db_path)
-        self._conn = sqlite3.connect(self.db_path)
+        # Callers may offload storage work to a thread (asyncio.to_thread);
+        # _lock serializes access, so the connection can cross threads
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.RLock()
         self._conn.row_factory = sqlite3.Row
+        self._in_transaction = False
         self._init_db()
         # In-memory embedding cache for fast vector search
         self._embedding_ids: list[str] = []
+        # proposition_id → cache row, so a re-stored embedding overwrites its row
+        self._row_of: dict[str, int] = {}
         self._embedding_matrix: np.ndarray | None = None
+        # Pre-normalized rows, so each query is one matvec with no corpus pass
+        self._embedding_matrix_norm: np.ndarray | None = None
+        # Backing buffers with spare capacity; the attributes above are views
+        self._buffers: tuple[np.ndarray, ...] | None = None
         self._load_embeddings_cache()
 
     def _init_db(self):
@@ -38,6 +122,7 @@ class SQLiteStorage(StorageService):
             PRAGMA busy_timeout=5000;
             PRAGMA foreign_keys=ON;
             PRAGMA cache_size=-64000;
+            PRAGMA temp_store=MEMORY;
 
             CREATE TABLE IF NOT EXISTS propositions (
                 id TEXT PRIMARY KEY,
@@ -55,6 +140,14 @@ class SQLiteStorage(StorageService):
                 status TEXT DEFAULT 'active'
             );
 
+            -- Range scans for find_by_timerange (ISO-8601 text sorts chronologically)
+            CREATE INDEX IF NOT EXISTS idx_propositions_created_at
+                ON propositions(created_at);
+
+            -- find_by_session: equality on session_id, already ordered by message_index
+            CREATE INDEX IF NOT EXISTS idx_propositions_session
+                ON propositions(session_id, message_index);
+
             CREATE TABLE IF NOT EXISTS embeddings (
                 proposition_id TEXT PRIMARY KEY,
                 embedding BLOB NOT NULL,
@@ -80,119 +173,227 @@ class SQLiteStorage(StorageService):
     def _load_embeddings_cache(self):
         """Load all embeddings into memory for numpy vector search."""
         rows = self._conn.execute(
-            "SELECT proposition_id, embedding, dimensions FROM embeddings"
+            "SELECT proposition_id, embedding FROM embeddings"
         ).fetchall()
 
+        self._embedding_ids = []
+        self._row_of = {}
+        self._buffers = None
+        self._set_views(0)
         if not rows:
-            self._embedding_ids = []
-            self._embedding_matrix = None
             return
 
-        self._embedding_ids = [row["proposition_id"] for row in rows]
-        vectors = [
-            np.frombuffer(row["embedding"], dtype=np.float32)
-            for row in rows
-        ]
-        self._embedding_matrix = np.vstack(vectors)
+        # All BLOBs share one dimension: join them and reshape once,
+        # instead of one frombuffer per row plus a vstack copy
+        ids = [row["proposition_id"] for row in rows]
+        dim = len(rows[0]["embedding"]) // np.dtype(np.float32).itemsize
+        blob = b"".join([row["embedding"] for row in rows])
+        self._append_embeddings(ids, np.frombuffer(blob, dtype=np.float32).reshape(-1, dim))
 
     def _row_to_proposition(self, row: sqlite3.Row) -> StoredProposition:
-        """Convert a database row to a StoredProposition."""
-        return StoredProposition(
-            id=row["id"],
-            text=row["text"],
-            node_type=row["node_type"],
-            confidence=row["confidence"],
-            source_type=row["source_type"],
-            created_at=row["created_at"],
-            session_id=row["session_id"],
-            message_index=row["message_index"],
-            source_char_start=row["source_char_start"],
-            source_char_end=row["source_char_end"],
-            source_file=row["source_file"],
-            domain_tags=json.loads(row["domain_tags"]),
-            status=row["status"],
-        )
+        """Convert a database row to a StoredProposition.
+
+        Column names match the dataclass fields, so the row maps straight across.
+        """
+        fields = dict(row)
+        fields["domain_tags"] = _decode_tags(fields["domain_tags"])
+        return StoredProposition(**fields)
 
+    @_locked
     def store_proposition(self, proposition: StoredProposition) -> str:
         """Store a proposition. Returns its ID."""
-        self._conn.execute(
-            """INSERT INTO propositions
-            (id, text, node_type, confidence, source_type, source_char_start,
-             source_char_end, source_file, created_at, session_id, message_index,
-             domain_tags, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                proposition.id,
-                proposition.text,
-                proposition.node_type,
-                proposition.confidence,
-                proposition.source_type,
-                proposition.source_char_start,
-                proposition.source_char_end,
-                proposition.source_file,
-                proposition.created_at,
-                proposition.session_id,
-                proposition.message_index,
-                json.dumps(proposition.domain_tags),
-                proposition.status,
-            ),
-        )
-        self._conn.commit()
+        self._conn.execute(_INSERT_PROPOSITION_SQL, self._proposition_params(proposition))
+        self._commit()
         return proposition.id
 
+    def _proposition_params(self, proposition: StoredProposition) -> tuple:
+        """Positional SQL parameters for a proposition row."""
+        # One C-level attrgetter call per row — no intermediate dict
+        return (*_proposition_fields(proposition), _encode_tags(proposition.domain_tags))
+
+    @_locked
     def store_embedding(self, proposition_id: str, embedding: np.ndarray, model: str) -> None:
         """Store an embedding and update the in-memory cache."""
         blob = embedding.astype(np.float32).tobytes()
         self._conn.execute(
-            "INSERT OR REPLACE INTO embeddings (proposition_id, embedding, model, dimensions) VALUES (?, ?, ?, ?)",
-            (proposition_id, blob, model, len(embedding)),
+            _INSERT_EMBEDDING_SQL, (proposition_id, blob, model, len(embedding))
         )
-        self._conn.commit()
+        self._commit()
+        self._append_embeddings([proposition_id], embedding.astype(np.float32).reshape(1, -1))
 
-        # Update in-memory cache (append, don't reload)
-        self._embedding_ids.append(proposition_id)
-        vec = embedding.astype(np.float32).reshape(1, -1)
-        if self._embedding_matrix is None:
-            self._embedding_matrix = vec
-        else:
-            self._embedding_matrix = np.vstack([self._embedding_matrix, vec])
+    @_locked
+    def store_propositions(
+        self, propositions: list[StoredProposition], embeddings: np.ndarray, model: str
+    ) -> list[str]:
+        """Store propositions and their embeddings in a single transaction."""
+        if not propositions:
+            return []
+
+        vectors = np.ascontiguousarray(np.atleast_2d(embeddings), dtype=np.float32)
+        # Each BLOB is a zero-copy slice of the one contiguous matrix buffer
+        row_bytes = vectors.shape[1] * vectors.itemsize
+        buffer = memoryview(vectors).cast("B")
+        with self.transaction():
+            self._conn.executemany(
+                _INSERT_PROPOSITION_SQL, map(self._proposition_params, propositions)
+            )
+            self._conn.executemany(
+                _INSERT_EMBEDDING_SQL,
+                (
+                    (p.id, buffer[i * row_bytes:(i + 1) * row_bytes], model, vectors.shape[1])
+                    for i, p in enumerate(propositions)
+                ),
+            )
+            ids = [p.id for p in propositions]
+            self._append_embeddings(ids, vectors)
+        return ids
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one commit (one WAL sync) instead of one per row.
+
+        store_* calls inside the block skip their own commit. On error the
+        writes are rolled back and the in-memory cache is reloaded to match.
+        Nested blocks join the outer transaction.
+        """
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+            self._in_transaction = True
+            try:
+                yield
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                # Appends and in-place overwrites both need undoing: rebuild
+                self._load_embeddings_cache()
+                raise
+            finally:
+                self._in_transaction = False
+
+    def _commit(self) -> None:
+        """Commit now, unless a transaction() block will commit for us."""
+        if not self._in_transaction:
+            self._conn.commit()
+
+    def _append_embeddings(self, ids: list[str], vectors: np.ndarray) -> None:
+        """Add rows to the in-memory cache (append, don't reload).
+
+        Rows go into preallocated buffers that double when full, so each
+        insert costs O(rows added) amortized instead of copying the cache.
+        An ID already in the cache is overwritten in place, mirroring the
+        INSERT OR REPLACE on disk, so re-stores never grow the scan.
+        """
+        normalized = _normalize_rows(vectors)
+
+        # Target row per input; the last write to an ID wins, as in SQL
+        start = len(self._embedding_ids)
+        targets: dict[int, int] = {}
+        for k, prop_id in enumerate(ids):
+            row = self._row_of.get(prop_id)
+            if row is None:
+                row = self._row_of[prop_id] = len(self._embedding_ids)
+                self._embedding_ids.append(prop_id)
+            targets[row] = k
+        end = len(self._embedding_ids)
+
+        self._reserve(end, vectors.shape[1], used=start)
+        rows = np.fromiter(targets.keys(), dtype=np.intp, count=len(targets))
+        sources = np.fromiter(targets.values(), dtype=np.intp, count=len(targets))
+        matrix, matrix_norm = self._buffers
+        matrix[rows] = vectors[sources]
+        matrix_norm[rows] = normalized[sources]
+        self._set_views(end)
+
+    def _reserve(self, rows: int, dim: int, used: int) -> None:
+        """Make sure the buffers hold at least `rows` rows, doubling capacity.
 
+        The first `used` rows are carried over when the buffers grow.
+        """
+        capacity = 0 if self._buffers is None else len(self._buffers[0])
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, _MIN_CAPACITY)
+        grown = (
+            np.empty((capacity, dim), dtype=np.float32),
+            np.empty((capacity, dim), dtype=np.float32),
+        )
+        if self._buffers is not None:
+            for new, old in zip(grown, self._buffers):
+                new[:used] = old[:used]
+        self._buffers = grown
+
+    def _set_views(self, rows: int) -> None:
+        """Point the cache attributes at the first `rows` rows of the buffers."""
+        if rows == 0:
+            self._embedding_matrix = None
+            self._embedding_matrix_norm = None
+            return
+        matrix, matrix_norm = self._buffers
+        self._embedding_matrix = matrix[:rows]
+        self._embedding_matrix_norm = matrix_norm[:rows]
+
+    @_locked
     def find_similar(self, embedding: np.ndarray, threshold: float = 0.85, limit: int = 10) -> list[SimilarResult]:
         """Find propositions with cosine similarity above threshold."""
         if self._embedding_matrix is None or len(self._embedding_ids) == 0:
             return []
 
-        # Cosine similarity: normalize query and corpus, then dot product
-        query_norm = embedding / (np.linalg.norm(embedding) + 1e-10)
-        corpus_norms = self._embedding_matrix / (
-            np.linalg.norm(self._embedding_matrix, axis=1, keepdims=True) + 1e-10
-        )
-        scores = corpus_norms @ query_norm
+        # Rows are pre-normalized: one BLAS matvec gives every cosine score
+        query_norm = _normalize_rows(embedding)[0]
+        scores = self._embedding_matrix_norm @ query_norm
 
         # Filter by threshold, sort descending, limit
-        mask = scores >= threshold
-        if not mask.any():
+        indices = np.flatnonzero(scores >= threshold)
+        if len(indices) == 0:
             return []
 
-        indices = np.where(mask)[0]
         matched_scores = scores[indices]
-        sorted_order = np.argsort(matched_scores)[::-1][:limit]
+        sorted_order = _top_k(matched_scores, limit)
+
+        hit_ids = [self._embedding_ids[indices[idx]] for idx in sorted_order]
+        propositions = self._get_propositions(hit_ids)
 
         results = []
-        for idx in sorted_order:
-            prop_id = self._embedding_ids[indices[idx]]
-            row = self._conn.execute(
-                "SELECT * FROM propositions WHERE id = ?", (prop_id,)
-            ).fetchone()
-            if row:
+        for prop_id, idx in zip(hit_ids, sorted_order):
+            proposition = propositions.get(prop_id)
+            if proposition:
                 results.append(
                     SimilarResult(
-                        proposition=self._row_to_proposition(row),
+                        proposition=proposition,
                         score=float(matched_scores[idx]),
                     )
                 )
         return results
 
+    @_locked
+    def find_similar_batch(self, embeddings: np.ndarray, threshold: float = 0.85) -> np.ndarray:
+        """For each row of embeddings, whether any stored embedding clears threshold."""
+        queries = _normalize_rows(embeddings)
+        if self._embedding_matrix is None or len(self._embedding_ids) == 0:
+            return np.zeros(len(queries), dtype=bool)
+
+        # One matmul scores the whole batch against the corpus
+        scores = queries @ self._embedding_matrix_norm.T
+        return (scores >= threshold).any(axis=1)
+
+    def _get_propositions(self, prop_ids: list[str]) -> dict[str, StoredProposition]:
+        """Fetch propositions by ID with one IN query per chunk of IDs."""
+        found = {}
+        # Stay under SQLite's bound-parameter limit on very large hit lists
+        for start in range(0, len(prop_ids), _MAX_SQL_PARAMS):
+            chunk = prop_ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT * FROM propositions WHERE id IN ({placeholders})", chunk
+            ).fetchall()
+            for row in rows:
+                proposition = self._row_to_proposition(row)
+                found[proposition.id] = proposition
+        return found
+
+    @_locked
     def find_by_timerange(self, start: datetime, end: datetime) -> list[StoredProposition]:
         """Find propositions created within a time range."""
         rows = self._conn.execute(
@@ -201,6 +402,7 @@ class SQLiteStorage(StorageService):
         ).fetchall()
         return [self._row_to_proposition(row) for row in rows]
 
+    @_locked
     def find_by_session(self, session_id: str) -> list[StoredProposition]:
         """Find all propositions from a specific conversation session."""
         rows = self._conn.execute(
@@ -209,12 +411,18 @@ class SQLiteStorage(StorageService):
         ).fetchall()
         return [self._row_to_proposition(row) for row in rows]
 
+    @_locked
     def get_all_embeddings(self) -> tuple[list[str], np.ndarray]:
-        """Load all embeddings. Returns (ids, embedding_matrix)."""
+        """Load all embeddings. Returns (ids, embedding_matrix).
+
+        Both are snapshots: the cache overwrites rows in place when an ID is
+        re-stored, so handing out a view would change the caller's matrix.
+        """
         if self._embedding_matrix is None:
             return [], np.array([], dtype=np.float32)
         return self._embedding_ids.copy(), self._embedding_matrix.copy()
 
+    @_locked
     def close(self):
         """Close the database connection."""
         self._conn.close()
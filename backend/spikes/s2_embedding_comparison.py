@@ -7,6 +7,8 @@ Decision: Clear winner becomes default for Component 1.3.
 """
 
 import time
+from functools import lru_cache
+
 import numpy as np
 import requests
 from sentence_transformers import SentenceTransformer
@@ -51,32 +53,48 @@ QUERIES = [
 ]
 
 
+# Keep-alive connection reused by the corpus and query embed calls
+_ollama_session = requests.Session()
+
+
+@lru_cache(maxsize=None)
+def _bge_model() -> SentenceTransformer:
+    """Load bge-base once (~400MB) and reuse it for corpus and queries."""
+    return SentenceTransformer("BAAI/bge-base-en-v1.5")
+
+
 def embed_bge(texts: list[str]) -> np.ndarray:
     """Embed with bge-base-en-v1.5 via sentence-transformers."""
-    model = SentenceTransformer("BAAI/bge-base-en-v1.5")
-    return model.encode(texts, normalize_embeddings=True)
+    return _bge_model().encode(texts, normalize_embeddings=True)
 
 
 def embed_gemma(texts: list[str]) -> np.ndarray:
-    """Embed with EmbeddingGemma via Ollama API."""
-    embeddings = []
-    for text in texts:
-        resp = requests.post(
-            "http://localhost:11434/api/embed",
-            json={"model": "embeddinggemma", "input": text},
-        )
-        resp.raise_for_status()
-        embeddings.append(resp.json()["embeddings"][0])
-    return np.array(embeddings, dtype=np.float32)
-
-
-def cosine_search(query_emb: np.ndarray, corpus_emb: np.ndarray, top_k: int = 5):
-    """Return indices of top-k most similar embeddings."""
-    query_norm = query_emb / (np.linalg.norm(query_emb) + 1e-10)
-    corpus_norm = corpus_emb / (np.linalg.norm(corpus_emb, axis=1, keepdims=True) + 1e-10)
-    scores = corpus_norm @ query_norm
-    top_indices = np.argsort(scores)[::-1][:top_k]
-    return top_indices, scores[top_indices]
+    """Embed with EmbeddingGemma via Ollama API — one request, list input."""
+    resp = _ollama_session.post(
+        "http://localhost:11434/api/embed",
+        json={"model": "embeddinggemma", "input": texts},
+    )
+    resp.raise_for_status()
+    return np.array(resp.json()["embeddings"], dtype=np.float32)
+
+
+def normalize(emb: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (or a single vector)."""
+    return emb / (np.linalg.norm(emb, axis=-1, keepdims=True) + 1e-10)
+
+
+def cosine_search(query_norms: np.ndarray, corpus_norm: np.ndarray, top_k: int = 5):
+    """Top-k corpus indices for every query at once. Inputs pre-normalized.
+
+    Returns (indices, scores), each shaped (num_queries, top_k), best first.
+    """
+    scores = query_norms @ corpus_norm.T  # one matmul for all queries
+    top_k = min(top_k, scores.shape[1])
+    # O(N) partition per row, then sort just the k survivors
+    top_indices = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    top_scores = np.take_along_axis(scores, top_indices, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top_indices, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
 
 
 def evaluate_model(name: str, embed_fn, propositions: list[str], queries: list):
@@ -92,25 +110,36 @@ def evaluate_model(name: str, embed_fn, propositions: list[str], queries: list):
     print(f"Embedded {len(propositions)} propositions in {embed_time:.2f}s")
     print(f"Embedding shape: {prop_embeddings.shape}")
 
-    # Run queries
-    total_hits = 0
-    total_expected = 0
+    # Embed all queries in one batch (one model pass / one HTTP round trip)
+    query_embeddings = embed_fn([query_text for query_text, _ in queries])
+
+    # Normalize once here rather than per query inside cosine_search
+    corpus_norm = normalize(prop_embeddings)
+    query_norms = normalize(query_embeddings)
+
+    # Run all queries in one batched search
+    all_top_indices, all_top_scores = cosine_search(query_norms, corpus_norm, top_k=5)
 
-    for query_text, expected_indices in queries:
-        query_emb = embed_fn([query_text])[0]
-        top_indices, top_scores = cosine_search(query_emb, prop_embeddings, top_k=5)
+    # expected_mask[q, i] is True when proposition i is a right answer for query q;
+    # gathering it at the top-k indices marks every hit without building sets
+    expected_mask = np.zeros((len(queries), len(propositions)), dtype=bool)
+    for q, (_, expected_indices) in enumerate(queries):
+        expected_mask[q, expected_indices] = True
+    hit_mask = np.take_along_axis(expected_mask, all_top_indices, axis=1)
 
-        # How many expected propositions appear in top-5?
-        hits = set(top_indices) & set(expected_indices)
-        total_hits += len(hits)
-        total_expected += len(expected_indices)
+    hits_per_query = hit_mask.sum(axis=1)
+    total_hits = int(hits_per_query.sum())
+    total_expected = int(expected_mask.sum())
 
-        hit_marker = "✓" if len(hits) == len(expected_indices) else "○" if hits else "✗"
+    for (query_text, expected_indices), top_indices, top_scores, hits, query_hits in zip(
+        queries, all_top_indices, all_top_scores, hits_per_query, hit_mask
+    ):
+        hit_marker = "✓" if hits == len(expected_indices) else "○" if hits else "✗"
         print(f"\n{hit_marker} Query: {query_text}")
         print(f"  Expected: {expected_indices}")
-        print(f"  Got top-5: {list(top_indices)} (scores: {[f'{s:.3f}' for s in top_scores]})")
-        for idx in top_indices[:3]:
-            marker = " ← HIT" if idx in expected_indices else ""
+        print(f"  Got top-5: {top_indices.tolist()} (scores: {[f'{s:.3f}' for s in top_scores]})")
+        for idx, is_hit in zip(top_indices[:3], query_hits[:3]):
+            marker = " ← HIT" if is_hit else ""
             print(f"    [{idx}] {propositions[idx][:70]}...{marker}")
 
     recall = total_hits / total_expected if total_expected > 0 else 0
@@ -16,8 +16,11 @@ sys.path.insert(0, "app")
 from pathlib import Path
 from services.parser import ConversationParser
 from services.extraction.extractor import ExtractionService
+from services.providers.cached_provider import CachedProvider
 from services.providers.groq_provider import GroqProvider
 
+EXTRACT_TIMEOUT_S = 30
+
 
 async def run_spike():
     # Parse real conversations
@@ -34,35 +37,63 @@ async def run_spike():
     print(f"Using Groq (llama-3.3-70b-versatile)")
     print("=" * 70)
 
-    provider = GroqProvider()
+    # Re-runs with an unchanged prompt are served from disk (VOKU_LLM_CACHE=off to skip)
+    provider = CachedProvider(GroqProvider())
     extractor = ExtractionService(provider)
 
+    # Calls are independent network round trips — run a few at a time.
+    # GroqProvider's own admission control still backs off on 429s.
+    sem = asyncio.Semaphore(4)
+
+    async def extract_one(i, msg):
+        async with sem:
+            try:
+                # Per-call budget so one hung socket can't stall the whole run
+                async with asyncio.timeout(EXTRACT_TIMEOUT_S):
+                    return i, msg, await extractor.extract(msg.text)
+            except Exception as e:
+                return i, msg, e
+
+    # One pooled keep-alive client serves every call; close it when done
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(extract_one(i, m)) for i, m in enumerate(sample)]
+    finally:
+        await provider.aclose()
+    results = [task.result() for task in tasks]
+
     total_propositions = 0
     total_messages = 0
 
-    for i, msg in enumerate(sample):
-        print(f"\n{'─'*70}")
-        print(f"MESSAGE {i+1} (from {msg.source_file}, index {msg.message_index})")
-        print(f"Timestamp: {msg.timestamp}")
-        print(f"Text ({len(msg.text)} chars):")
+    # Tasks are read back in input order, so output is deterministic.
+    # Each message's report is built as lines and written in one call.
+    for i, msg, outcome in results:
         # Show first 300 chars
         preview = msg.text[:300] + ("..." if len(msg.text) > 300 else "")
-        print(f"  {preview}")
-        print()
-
-        try:
-            propositions = await extractor.extract(msg.text)
+        lines = [
+            f"\n{'─'*70}",
+            f"MESSAGE {i+1} (from {msg.source_file}, index {msg.message_index})",
+            f"Timestamp: {msg.timestamp}",
+            f"Text ({len(msg.text)} chars):",
+            f"  {preview}",
+            "",
+        ]
+
+        if isinstance(outcome, Exception):
+            lines.append(f"  → EXTRACTION FAILED: {type(outcome).__name__}: {outcome}")
+        else:
+            propositions = outcome
             total_propositions += len(propositions)
             total_messages += 1
 
-            print(f"  → Extracted {len(propositions)} propositions:")
+            lines.append(f"  → Extracted {len(propositions)} propositions:")
             for j, p in enumerate(propositions):
-                print(f"    [{j+1}] ({p.node_purpose}, {p.source_type}, conf={p.confidence})")
-                print(f"        \"{p.proposition}\"")
+                lines.append(f"    [{j+1}] ({p.node_type}, conf={p.confidence})")
+                lines.append(f"        \"{p.proposition}\"")
                 if p.structured_data:
-                    print(f"        data: {json.dumps(p.structured_data, indent=None)[:100]}")
-        except Exception as e:
-            print(f"  → EXTRACTION FAILED: {e}")
+                    lines.append(f"        data: {json.dumps(p.structured_data, indent=None)[:100]}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print(f"\n{'='*70}")
     print(f"SUMMARY")
@@ -75,7 +106,7 @@ async def run_spike():
     print("  [ ] Propositions are specific (not vague)")
     print("  [ ] User's voice preserved (not clinical)")
     print("  [ ] Non-redundant (no duplicates)")
-    print("  [ ] Appropriate node_purpose labels")
+    print("  [ ] Appropriate node_type labels")
     print("  [ ] structured_data used for metrics/numbers")
     print("  [ ] No hallucinated content")
 
@@ -1,5 +1,49 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 # Add app/ to Python path so tests can import from services.*, models.*, etc.
 sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+
+class CachedEmbedder:
+    """Memoizes vectors per input text — the model is deterministic, so a
+    repeated string across tests skips its forward pass."""
+
+    def __init__(self, base):
+        self._base = base
+        self._cache: dict = {}
+
+    def embed(self, text):
+        if text not in self._cache:
+            vec = self._base.embed(text)
+            vec.flags.writeable = False  # shared across tests
+            self._cache[text] = vec
+        return self._cache[text]
+
+    def embed_batch(self, texts):
+        misses = list(dict.fromkeys(t for t in texts if t not in self._cache))
+        if misses:
+            for text, vec in zip(misses, self._base.embed_batch(misses)):
+                vec.flags.writeable = False
+                self._cache[text] = vec
+        return np.stack([self._cache[t] for t in texts])
+
+    @property
+    def dimensions(self):
+        return self._base.dimensions
+
+    @property
+    def model_name(self):
+        return self._base.model_name
+
+
+@pytest.fixture(scope="session")
+def embedder():
+    """Real BGE model, loaded once per test run (~400MB). Imported lazily so
+    tests that don't need it run without sentence-transformers."""
+    from services.embedding.bge import BGEBaseEmbedding
+
+    return CachedEmbedder(BGEBaseEmbedding())
@@ -0,0 +1,75 @@
+"""
+Tests for ExtractionService response parsing (no network — canned provider).
+"""
+
+import json
+
+import pytest
+
+from services.extraction import ExtractionError, ExtractionService
+from services.providers.base import Provider
+
+RESPONSE = {
+    "propositions": [
+        {
+            "proposition": "I think my main limiter for rowing is my ankle",
+            "node_type": "belief",
+            "confidence": 0.9,
+        }
+    ]
+}
+
+
+class CannedProvider(Provider):
+    def __init__(self, response: str):
+        self.response = response
+
+    async def vision(self, image_base64: str, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def complete(self, prompt, *, system_prompt=None, model=None) -> str:
+        return self.response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "raw",
+    [
+        json.dumps(RESPONSE),
+        f"```json\n{json.dumps(RESPONSE, indent=2)}\n```",
+        f"Here are the propositions:\n{json.dumps(RESPONSE)}\nLet me know!",
+    ],
+    ids=["bare", "fenced", "prose"],
+)
+async def test_extract_parses_bare_or_wrapped_json(raw):
+    propositions = await ExtractionService(CannedProvider(raw)).extract("text")
+
+    assert [p.proposition for p in propositions] == [
+        "I think my main limiter for rowing is my ankle"
+    ]
+    assert propositions[0].node_type == "belief"
+
+
+@pytest.mark.asyncio
+async def test_extract_unwraps_fenced_json_without_a_failed_parse(monkeypatch):
+    # Arrange — record every string handed to json.loads
+    calls = []
+    real_loads = json.loads
+    monkeypatch.setattr(
+        "services.extraction.extractor.json.loads",
+        lambda s, **kw: calls.append(s) or real_loads(s, **kw),
+    )
+    raw = f"```json\n{json.dumps(RESPONSE)}\n```"
+
+    # Act
+    await ExtractionService(CannedProvider(raw)).extract("text")
+
+    # Assert — one parse, of the object span only
+    assert calls == [json.dumps(RESPONSE)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw", ["no json here", "```json\n{not valid}\n```"])
+async def test_extract_rejects_unparseable_response(raw):
+    with pytest.raises(ExtractionError, match="invalid JSON"):
+        await ExtractionService(CannedProvider(raw)).extract("text")
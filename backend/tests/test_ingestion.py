@@ -4,7 +4,9 @@ Tests for ingestion pipeline.
 Component 1.4 in COMPONENT_SPEC.md.
 """
 
-from datetime import datetime
+import asyncio
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 
 import numpy as np
@@ -37,6 +39,14 @@ class MockExtractionService:
         ]
 
 
+class RepeatingExtractionService:
+    """Mock extraction — returns the same proposition twice in one message."""
+
+    async def extract(self, text: str) -> list[Proposition]:
+        prop = Proposition(proposition=f"Repeated: {text[:30]}", node_type="belief", confidence=0.9)
+        return [prop, prop]
+
+
 class FailingExtractionService:
     """Mock extraction — always raises an error. For error handling test."""
 
@@ -57,6 +67,22 @@ class SelectiveExtractionService:
         return await self._normal.extract(text)
 
 
+class SlowExtractionService:
+    """Mock extraction with latency — records how many calls overlap."""
+
+    def __init__(self):
+        self._normal = MockExtractionService()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def extract(self, text: str) -> list[Proposition]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await self._normal.extract(text)
+
+
 class MockEmbeddingProvider:
     """Mock embedder — deterministic vectors from text hash."""
 
@@ -79,12 +105,36 @@ class MockEmbeddingProvider:
         return "mock-embedding"
 
 
+class RendezvousEmbeddingProvider(MockEmbeddingProvider):
+    """Mock embedder that holds each caller until `parties` threads are embedding,
+    so concurrent ingests all reach the dedup check together."""
+
+    def __init__(self, parties: int):
+        self._barrier = threading.Barrier(parties, timeout=5)
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        self._barrier.wait()
+        return super().embed_batch(texts)
+
+
+class SelectiveEmbeddingProvider(MockEmbeddingProvider):
+    """Mock embedder that fails on any batch containing `fail_on`."""
+
+    def __init__(self, fail_on: str):
+        self._fail_on = fail_on
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        if any(self._fail_on in t for t in texts):
+            raise Exception("Embedding failed")
+        return super().embed_batch(texts)
+
+
 # --- Fixtures ---
 
 
 @pytest.fixture
-def storage(tmp_path):
-    db = SQLiteStorage(tmp_path / "test.db")
+def storage():
+    db = SQLiteStorage(":memory:")
     yield db
     db.close()
 
@@ -224,6 +274,42 @@ async def test_ingest_duplicate_proposition(ingestion, storage, sample_message):
     assert len(stored) == 2
 
 
+@pytest.mark.asyncio
+async def test_concurrent_ingests_of_same_message_store_once(storage, sample_message):
+    """Two ingests racing on one message → dedup check and insert are atomic."""
+    ingestion = IngestionService(
+        storage=storage,
+        extraction=MockExtractionService(),
+        embedder=RendezvousEmbeddingProvider(parties=2),
+    )
+
+    results = await asyncio.gather(
+        ingestion.ingest_message(sample_message),
+        ingestion.ingest_message(sample_message),
+    )
+
+    assert sum(r.propositions_stored for r in results) == 2
+    assert sum(r.duplicates_found for r in results) == 2
+    assert len(storage.find_by_session("session-abc")) == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_dedups_within_one_message(storage, mock_embedder, sample_message):
+    """Same proposition twice in one extraction → stored once."""
+    ingestion = IngestionService(
+        storage=storage,
+        extraction=RepeatingExtractionService(),
+        embedder=mock_embedder,
+    )
+
+    result = await ingestion.ingest_message(sample_message)
+
+    assert result.propositions_extracted == 2
+    assert result.propositions_stored == 1
+    assert result.duplicates_found == 1
+    assert len(storage.find_by_session("session-abc")) == 1
+
+
 @pytest.mark.asyncio
 async def test_ingest_full_conversation(ingestion, storage, conversation_messages):
     """Ingest conversation → user messages processed, assistant skipped."""
@@ -240,6 +326,55 @@ async def test_ingest_full_conversation(ingestion, storage, conversation_message
     assert len(stored) == result.total_propositions_stored
 
 
+@pytest.mark.asyncio
+async def test_ingest_conversation_dedups_across_messages(
+    ingestion, storage, sample_message
+):
+    """Repeated message in one conversation → only the first copy is stored."""
+    repeat = ConversationMessage(**{**vars(sample_message), "message_index": 2})
+
+    result = await ingestion.ingest_conversation([sample_message, repeat])
+
+    assert result.total_propositions_extracted == 4
+    assert result.total_propositions_stored == 2
+    stored = storage.find_by_session("session-abc")
+    assert {p.message_index for p in stored} == {0}
+
+
+@pytest.mark.asyncio
+async def test_ingest_conversation_extracts_concurrently(
+    storage, mock_embedder, conversation_messages
+):
+    """LLM calls overlap, but propositions are stored in message order."""
+    slow_extractor = SlowExtractionService()
+    ingestion = IngestionService(
+        storage=storage,
+        extraction=slow_extractor,
+        embedder=mock_embedder,
+    )
+
+    result = await ingestion.ingest_conversation(conversation_messages)
+
+    assert slow_extractor.max_in_flight == 3
+    assert result.total_propositions_stored == 6
+    stored = storage.find_by_session("session-abc")
+    assert [p.message_index for p in stored] == [0, 0, 2, 2, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_ingest_conversation_stamps_one_timestamp(
+    ingestion, storage, conversation_messages
+):
+    """All propositions in a conversation share the batch's created_at."""
+    now = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+    await ingestion.ingest_conversation(conversation_messages, now)
+
+    stored = storage.find_by_session("session-abc")
+    assert stored
+    assert {p.created_at for p in stored} == {now.isoformat()}
+
+
 @pytest.mark.asyncio
 async def test_ingest_directory(ingestion, storage, tmp_path):
     """Ingest directory → multiple sessions processed."""
@@ -252,6 +387,26 @@ async def test_ingest_directory(ingestion, storage, tmp_path):
     assert result.total_propositions_stored > 0
 
 
+@pytest.mark.asyncio
+async def test_ingest_directory_parses_in_order(ingestion, tmp_path):
+    """Files are handled in name order; a bad file is reported, others ingest."""
+    for name, session in [("a.md", "aaa111"), ("c.md", "ccc333")]:
+        (tmp_path / name).write_text(
+            f"**Link:** [https://claude.ai/chat/{session}](https://claude.ai/chat/{session})\n\n"
+            "## Prompt:\n2/10/2026, 9:53:12 PM\n\n"
+            f"Message from session {session}.\n",
+            encoding="utf-8",
+        )
+    for name in ["b_broken.md", "d_broken.md"]:
+        (tmp_path / name).write_text("## Prompt:\nno link header\n", encoding="utf-8")
+
+    result = await ingestion.ingest_directory(tmp_path)
+
+    assert result.sessions_processed == 2
+    assert result.total_propositions_stored == 4
+    assert [e.split(":")[0] for e in result.errors] == ["Parse b_broken.md", "Parse d_broken.md"]
+
+
 @pytest.mark.asyncio
 async def test_ingest_error_handling(storage, mock_embedder, conversation_messages):
     """Extraction fails on one message → others still processed."""
@@ -270,3 +425,20 @@ async def test_ingest_error_handling(storage, mock_embedder, conversation_messag
     assert result.total_propositions_stored == 4
     assert len(result.errors) == 1
     assert "ankle" in result.errors[0] or "failed" in result.errors[0].lower()
+
+
+@pytest.mark.asyncio
+async def test_ingest_store_failure_loses_only_that_message(storage, conversation_messages):
+    """Batch store fails on one message → falls back per message, others stored."""
+    ingestion = IngestionService(
+        storage=storage,
+        extraction=MockExtractionService(),
+        embedder=SelectiveEmbeddingProvider(fail_on="breathing"),
+    )
+
+    result = await ingestion.ingest_conversation(conversation_messages)
+
+    # 3 user messages, the breathing one (index 2) fails to embed → 2 × 2 stored
+    assert result.total_propositions_stored == 4
+    assert result.errors == ["Message 2: Embedding failed"]
+    assert len(storage.find_by_session("session-abc")) == 4
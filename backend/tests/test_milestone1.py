@@ -26,7 +26,6 @@ pytestmark = pytest.mark.skipif(
     reason="GROQ_API_KEY not set — skipping integration test",
 )
 
-from services.embedding.bge import BGEBaseEmbedding
 from services.extraction import ExtractionService
 from services.ingestion import IngestionService
 from services.parser import ConversationParser
@@ -41,12 +40,6 @@ EXPECTED_SESSION_ID = "9a9c2191-84b1-4e48-9906-76509116bc8b"
 # ── Fixtures ──────────────────────────────────────────────────────────
 
 
-@pytest.fixture(scope="module")
-def embedder():
-    """Real BGE model. scope=module so it loads once for all tests in this file."""
-    return BGEBaseEmbedding()
-
-
 @pytest.fixture
 def storage(tmp_path):
     """Fresh SQLite database per test."""
@@ -1,18 +1,22 @@
 from datetime import datetime
 from pathlib import Path
 
+import pytest
+
 from services.parser import ConversationParser
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures" / "real"
+DEEP_RESEARCH = FIXTURES_DIR / "Deep Research on Voku Plans.md"
 
 
-def test_parse_single_conversation_basic():
-    # Arrange
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
+@pytest.fixture(scope="module")
+def deep_research_messages():
+    """Parse the largest real export once; tests only read the messages."""
+    return ConversationParser().parse_file(DEEP_RESEARCH)
 
-    # Act
-    messages = parser.parse_file(filepath)
+
+def test_parse_single_conversation_basic(deep_research_messages):
+    messages = deep_research_messages
 
     # Assert
     assert len(messages) > 0
@@ -36,13 +40,9 @@ def test_parse_base64_image_stripped():
     assert "training protocol" in usr_msg.text
 
 
-def test_parse_thinking_blocks_extracted():
+def test_parse_thinking_blocks_extracted(deep_research_messages):
     # Arrange
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
-
-    # Act
-    messages = parser.parse_file(filepath)
+    messages = deep_research_messages
     assistant_msg = [m for m in messages if m.speaker == "assistant"]
     first_msg = assistant_msg[0]
 
@@ -56,26 +56,17 @@ def test_parse_thinking_blocks_extracted():
     assert user_msg[0].assistant_reasoning is None
 
 
-def test_parse_us_locale_timestamp():
+def test_parse_us_locale_timestamp(deep_research_messages):
     # Arrange
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
-
-    # Act
-    messages = parser.parse_file(filepath)
+    messages = deep_research_messages
     expected = datetime(2026, 2, 10, 21, 53, 12)  # Feb 10, 2026, 9:53:12 PM
 
     # Assert
     assert messages[0].timestamp == expected
 
 
-def test_parse_session_id_from_link():
-    # Arrange
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
-
-    # Act
-    messages = parser.parse_file(filepath)
+def test_parse_session_id_from_link(deep_research_messages):
+    messages = deep_research_messages
 
     # Assert
     assert messages[0].session_id == "9a9c2191-84b1-4e48-9906-76509116bc8b"
@@ -86,8 +77,24 @@ def test_parse_session_id_from_link():
         )  # All messages should have the same session ID
 
 
-def test_parse_empty_messages_skipped():
-    pass
+def test_parse_empty_messages_skipped(tmp_path):
+    # Arrange: a prompt with no body and a response that is only an image
+    filepath = tmp_path / "Empty Messages.md"
+    filepath.write_text(
+        "**Link:** [https://claude.ai/chat/abc123](https://claude.ai/chat/abc123)\n\n"
+        "## Prompt:\n2/10/2026, 9:53:12 PM\n\n"
+        "## Response:\n2/10/2026, 9:53:20 PM\n\n"
+        "![shot](data:image/png;base64,iVBORw0KGgo=)\n\n"
+        "## Prompt:\n2/10/2026, 9:54:00 PM\n\nActual question.\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    messages = ConversationParser().parse_file(filepath)
+
+    # Assert
+    assert [(m.speaker, m.text) for m in messages] == [("user", "Actual question.")]
+    assert messages[0].message_index == 0
 
 
 def test_parse_directory():
@@ -101,29 +108,127 @@ def test_parse_directory():
     assert len(session_ids) == 3  # One per fixture file
 
 
-def test_parse_footer_stripped():
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
-
-    messages = parser.parse_file(filepath)
-    last_msg = messages[-1]
+def test_parse_footer_stripped(deep_research_messages):
+    last_msg = deep_research_messages[-1]
 
     assert "Claude Exporter" not in last_msg.text
     assert "ai-chat-exporter" not in last_msg.text
 
 
-def test_roundtrip_known_output():
-    # TODO: create small synthetic fixture with exact expected output
-    pass
+def test_roundtrip_known_output(tmp_path):
+    # Arrange
+    filepath = tmp_path / "Known Output.md"
+    filepath.write_text(
+        "# Known Output\n\n"
+        "**Link:** [https://claude.ai/chat/abc123](https://claude.ai/chat/abc123)\n\n"
+        "## Prompt:\n2/10/2026, 9:53:12 PM\n\nShould I row today?\n\n"
+        "## Response:\n2/10/2026, 9:53:39 PM\n\n"
+        "````plaintext\nThought process: Check the ankle first.\n````\n\n"
+        "Rest the ankle today.\n\n"
+        "---\nPowered by [Claude Exporter](https://www.claudexporter.com)\n",
+        encoding="utf-8",
+    )
 
+    # Act
+    messages = ConversationParser().parse_file(filepath)
 
-def test_char_offsets_match_source():
-    parser = ConversationParser()
-    filepath = FIXTURES_DIR / "Deep Research on Voku Plans.md"
+    # Assert
+    assert [
+        (m.speaker, m.text, m.timestamp, m.message_index, m.assistant_reasoning)
+        for m in messages
+    ] == [
+        ("user", "Should I row today?", datetime(2026, 2, 10, 21, 53, 12), 0, None),
+        (
+            "assistant", "Rest the ankle today.", datetime(2026, 2, 10, 21, 53, 39), 1,
+            "Thought process: Check the ankle first.",
+        ),
+    ]
+    assert {m.session_id for m in messages} == {"abc123"}
+    assert {m.source_file for m in messages} == {"Known Output.md"}
+
+
+def test_char_offsets_match_source(deep_research_messages):
+    raw_text = DEEP_RESEARCH.read_text(encoding="utf-8")
+
+    for msg in deep_research_messages:
+        sliced = raw_text[msg.source_char_start:msg.source_char_end]
+        assert msg.text in sliced
 
-    raw_text = filepath.read_text(encoding="utf-8")
-    messages = parser.parse_file(filepath)
 
+def test_char_offsets_are_exact_spans_after_fenced_blocks(tmp_path):
+    # Arrange: the answer repeats the prompt, so a text search would land early
+    filepath = tmp_path / "Repeated Text.md"
+    raw_text = (
+        "**Link:** [https://claude.ai/chat/abc123](https://claude.ai/chat/abc123)\n\n"
+        "## Prompt:\n2/10/2026, 9:53:12 PM\n\nSame words.\n\n"
+        "## Response:\n2/10/2026, 9:53:39 PM\n\n"
+        "````plaintext\nThought process: Same words.\n````\n\n"
+        "````plaintext\nSame words.\n````\n\n"
+        "Same words.\n"
+    )
+    filepath.write_text(raw_text, encoding="utf-8")
+
+    # Act
+    messages = ConversationParser().parse_file(filepath)
+
+    # Assert
+    assert [m.text for m in messages] == ["Same words.", "Same words."]
+    assert messages[1].assistant_reasoning == "Thought process: Same words.\n\nSame words."
     for msg in messages:
-        sliced = raw_text[msg.source_char_start:msg.source_char_end]
-        assert msg.text in sliced
+        assert raw_text[msg.source_char_start:msg.source_char_end] == msg.text
+    assert messages[1].source_char_end == len(raw_text) - 1
+
+
+def test_parse_image_between_paragraphs_collapses_blank_lines(tmp_path):
+    # Arrange
+    filepath = tmp_path / "Image Paragraphs.md"
+    filepath.write_text(
+        "# Image Paragraphs\n\n"
+        "**Link:** [https://claude.ai/chat/abc123](https://claude.ai/chat/abc123)\n\n"
+        "## Prompt:\n2/10/2026, 9:53:12 PM\n\n"
+        "First paragraph.\n\n"
+        "![shot](data:image/png;base64,iVBORw0KGgo=)\n\n"
+        "Second paragraph.\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    messages = ConversationParser().parse_file(filepath)
+
+    # Assert
+    assert messages[0].text == "First paragraph.\n\nSecond paragraph."
+
+
+def test_parse_midnight_and_noon_timestamps(tmp_path):
+    # Arrange
+    filepath = tmp_path / "Clock.md"
+    filepath.write_text(
+        "**Link:** [https://claude.ai/chat/abc123](https://claude.ai/chat/abc123)\n\n"
+        "## Prompt:\n1/5/2026, 12:05:09 AM\n\nJust after midnight.\n\n"
+        "## Response:\n1/5/2026, 12:30:00 PM\n\nJust after noon.\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    messages = ConversationParser().parse_file(filepath)
+
+    # Assert
+    assert messages[0].timestamp == datetime(2026, 1, 5, 0, 5, 9)
+    assert messages[1].timestamp == datetime(2026, 1, 5, 12, 30, 0)
+
+
+def test_parse_directory_keeps_file_order(tmp_path):
+    # Arrange
+    for i in range(3):
+        (tmp_path / f"Conversation {i}.md").write_text(
+            f"**Link:** [https://claude.ai/chat/abc{i}](https://claude.ai/chat/abc{i})\n\n"
+            f"## Prompt:\n1/5/2026, 9:00:0{i} AM\n\nMessage from file {i}.\n",
+            encoding="utf-8",
+        )
+
+    # Act
+    messages = ConversationParser().parse_directory(tmp_path)
+
+    # Assert
+    assert [m.session_id for m in messages] == ["abc0", "abc1", "abc2"]
+    assert [m.text for m in messages] == [f"Message from file {i}." for i in range(3)]
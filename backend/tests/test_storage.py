@@ -14,13 +14,38 @@ from services.storage.models import StoredProposition
 
 
 @pytest.fixture
-def storage(tmp_path):
-    """Create a fresh SQLite storage in a temp directory."""
-    db = SQLiteStorage(tmp_path / "test.db")
+def storage():
+    """Fresh in-memory SQLite storage — no file I/O or fsync per test.
+    Tests that exercise persistence open their own file under tmp_path."""
+    db = SQLiteStorage(":memory:")
     yield db
     db.close()
 
 
+@pytest.fixture
+def store_corpus(storage):
+    """Bulk-store propositions with embeddings in one transaction (executemany).
+
+    With a session_id, propositions get message_index 0, 1, ... in order.
+    Pass db to store into a storage other than the fixture's.
+    """
+
+    def store(ids, vectors, session_id=None, db=None):
+        props = [
+            StoredProposition(
+                id=prop_id, text=f"Proposition {prop_id}", node_type="belief",
+                confidence=0.9, source_type="conversation",
+                created_at="2026-02-10T08:00:00", session_id=session_id,
+                message_index=i if session_id is not None else None,
+            )
+            for i, prop_id in enumerate(ids)
+        ]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return (db or storage).store_propositions(props, vectors, "bge-base-en-v1.5")
+
+    return store
+
+
 @pytest.fixture
 def sample_proposition():
     """A reusable test proposition."""
@@ -64,6 +89,34 @@ def test_store_embedding_and_find_similar(storage, sample_proposition):
     assert results[0].score > 0.99
 
 
+def test_find_similar_limit_keeps_best_scores_in_order(storage, store_corpus):
+    rng = np.random.RandomState(6)
+    base = rng.randn(768).astype(np.float32)
+    store_corpus(
+        [f"match-{i}" for i in range(30)],
+        [base + 0.02 * i * rng.randn(768).astype(np.float32) for i in range(30)],
+    )
+
+    results = storage.find_similar(base, threshold=0.5, limit=3)
+
+    scores = [r.score for r in results]
+    assert [r.proposition.id for r in results] == ["match-0", "match-1", "match-2"]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_find_similar_fetches_hits_in_one_query(storage, store_corpus):
+    base = np.random.RandomState(4).randn(768).astype(np.float32)
+    store_corpus([f"near-{i}" for i in range(5)], [base + 0.01 * i for i in range(5)])
+
+    statements = []
+    storage._conn.set_trace_callback(statements.append)
+    results = storage.find_similar(base, threshold=0.9)
+    storage._conn.set_trace_callback(None)
+
+    assert [r.proposition.id for r in results] == [f"near-{i}" for i in range(5)]
+    assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+
 def test_find_similar_below_threshold_returns_empty(storage, sample_proposition):
     storage.store_proposition(sample_proposition)
 
@@ -75,6 +128,93 @@ def test_find_similar_below_threshold_returns_empty(storage, sample_proposition)
     assert len(results) == 0
 
 
+def test_find_similar_scores_are_exact_cosine(storage, store_corpus):
+    rng = np.random.RandomState(0)
+    corpus = rng.randn(50, 768).astype(np.float32)
+    store_corpus([f"p{i}" for i in range(50)], corpus)
+
+    query = corpus[7] + 0.1 * rng.randn(768).astype(np.float32)
+    results = storage.find_similar(query, threshold=0.5, limit=3)
+
+    expected = float(
+        corpus[7] @ query / (np.linalg.norm(corpus[7]) * np.linalg.norm(query))
+    )
+    assert results[0].proposition.id == "p7"
+    assert results[0].score == pytest.approx(expected, abs=1e-5)
+
+
+def test_store_propositions_batch_and_find_similar_batch(storage, store_corpus):
+    rng = np.random.RandomState(1)
+    vectors = rng.randn(3, 768).astype(np.float32)
+
+    ids = store_corpus(["p0", "p1", "p2"], vectors, session_id="sess-batch")
+    assert ids == ["p0", "p1", "p2"]
+    assert [p.message_index for p in storage.find_by_session("sess-batch")] == [0, 1, 2]
+    assert storage.get_all_embeddings()[1].shape == (3, 768)
+
+    queries = np.vstack([vectors[1], rng.randn(768).astype(np.float32)])
+    assert storage.find_similar_batch(queries, threshold=0.95).tolist() == [True, False]
+
+
+def test_embedding_cache_survives_buffer_growth(tmp_path, store_corpus):
+    db = SQLiteStorage(tmp_path / "grow.db")
+    rng = np.random.RandomState(2)
+    vectors = rng.randn(1300, 768).astype(np.float32)
+    prop_ids = [f"g{i}" for i in range(1300)]
+
+    # Second batch overflows the first buffer allocation
+    store_corpus(prop_ids[:1000], vectors[:1000], db=db)
+    store_corpus(prop_ids[1000:], vectors[1000:], db=db)
+
+    ids, matrix = db.get_all_embeddings()
+    assert ids == prop_ids
+    np.testing.assert_array_equal(matrix, vectors)
+    assert db.find_similar(vectors[5], threshold=0.99)[0].proposition.id == "g5"
+    db.close()
+
+    reopened = SQLiteStorage(tmp_path / "grow.db")
+    np.testing.assert_array_equal(reopened.get_all_embeddings()[1], vectors)
+    reopened.close()
+
+
+def test_restored_embedding_overwrites_its_cache_row(storage, sample_proposition):
+    rng = np.random.RandomState(5)
+    old, new = rng.randn(2, 768).astype(np.float32)
+    storage.store_proposition(sample_proposition)
+
+    storage.store_embedding(sample_proposition.id, old, "bge-base-en-v1.5")
+    storage.store_embedding(sample_proposition.id, new, "bge-base-en-v1.5")
+
+    ids, matrix = storage.get_all_embeddings()
+    assert ids == [sample_proposition.id]
+    np.testing.assert_array_equal(matrix[0], new)
+    assert storage.find_similar(old, threshold=0.9) == []
+    assert storage.find_similar(new, threshold=0.99)[0].proposition.id == sample_proposition.id
+
+    # A matrix the caller already holds is a snapshot, untouched by re-stores
+    storage.store_embedding(sample_proposition.id, old, "bge-base-en-v1.5")
+    np.testing.assert_array_equal(matrix[0], new)
+
+
+def test_transaction_groups_writes_and_rolls_back(storage, sample_proposition):
+    vec = np.random.RandomState(3).randn(768).astype(np.float32)
+
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.store_proposition(sample_proposition)
+            storage.store_embedding(sample_proposition.id, vec, "bge-base-en-v1.5")
+            raise RuntimeError("abort ingest")
+
+    assert storage.find_by_session("session-abc") == []
+    assert storage.get_all_embeddings()[0] == []
+
+    with storage.transaction():
+        storage.store_proposition(sample_proposition)
+        storage.store_embedding(sample_proposition.id, vec, "bge-base-en-v1.5")
+    assert len(storage.find_by_session("session-abc")) == 1
+    assert storage.find_similar(vec, threshold=0.99)[0].proposition.id == sample_proposition.id
+
+
 def test_find_by_timerange(storage):
     p1 = StoredProposition(
         id="p1", text="Morning belief", node_type="belief",
@@ -104,6 +244,31 @@ def test_find_by_timerange(storage):
     assert results[1].id == "p2"
 
 
+def query_plan(storage, call) -> str:
+    """EXPLAIN QUERY PLAN for the SELECT a storage method actually issues."""
+    statements = []
+    storage._conn.set_trace_callback(statements.append)
+    call()
+    storage._conn.set_trace_callback(None)
+    [select] = [s for s in statements if s.startswith("SELECT")]
+    plan = storage._conn.execute(f"EXPLAIN QUERY PLAN {select}").fetchall()
+    return " ".join(row[-1] for row in plan)
+
+
+def test_find_by_timerange_uses_created_at_index(storage):
+    details = query_plan(
+        storage,
+        lambda: storage.find_by_timerange(datetime(2026, 2, 10), datetime(2026, 2, 11)),
+    )
+    assert "idx_propositions_created_at" in details
+
+
+def test_find_by_session_uses_session_index(storage):
+    details = query_plan(storage, lambda: storage.find_by_session("session-abc"))
+    assert "idx_propositions_session" in details
+    assert "TEMP B-TREE" not in details
+
+
 def test_find_by_session(storage):
     p1 = StoredProposition(
         id="p1", text="First message", node_type="observation",
@@ -140,10 +305,15 @@ def test_get_all_embeddings_shape(storage, sample_proposition):
     assert len(ids) == 1
     assert matrix.shape == (1, 768)
 
+    # Editing the returned copy leaves the search cache alone
+    matrix[0] = 0
+    assert storage.find_similar(emb, threshold=0.99)[0].proposition.id == "test-uuid-001"
+
 
 def test_empty_database_returns_empty(storage):
     assert storage.find_by_session("nonexistent") == []
     assert storage.find_similar(np.random.randn(768).astype(np.float32)) == []
+    assert storage.find_similar_batch(np.random.randn(2, 768)).tolist() == [False, False]
     ids, matrix = storage.get_all_embeddings()
     assert len(ids) == 0
 
@@ -163,3 +333,21 @@ def test_database_is_single_file(tmp_path):
     results = db2.find_by_timerange(datetime(2026, 1, 1), datetime(2026, 12, 31))
     assert results[0].text == "Test"
     db2.close()
+
+
+def test_domain_tags_roundtrip(storage):
+    storage.store_proposition(StoredProposition(
+        id="p1", text="Tagged", node_type="belief",
+        confidence=0.9, source_type="conversation",
+        created_at="2026-02-10T08:00:00", session_id="sess-1",
+        domain_tags=["rowing", "health"],
+    ))
+    storage.store_proposition(StoredProposition(
+        id="p2", text="Untagged", node_type="belief",
+        confidence=0.9, source_type="conversation",
+        created_at="2026-02-10T08:00:01", session_id="sess-1",
+    ))
+
+    results = storage.find_by_session("sess-1")
+    tags = {p.id: p.domain_tags for p in results}
+    assert tags == {"p1": ["rowing", "health"], "p2": []}